@@ -709,22 +709,18 @@ class M3202A(Base, PulserInterface):
 
         c_double_p = ctypes.POINTER(ctypes.c_double)
         if len(waveformDataA) > 0 and (waveformDataB is None or len(waveformDataA) == len(waveformDataB)):
-            if isinstance(waveformDataA, np.ndarray):
-                # print(type(waveformDataA), waveformDataA.dtype)
-                waveform_dataA_C = waveformDataA.ctypes.data_as(c_double_p)
-                length = len(waveformDataA)
-            else:
-                waveform_dataA_C = (ctypes.c_double * len(waveformDataA))(*waveformDataA)
-                length = waveform_dataA_C._length_
+            # The DLL reads contiguous doubles. ascontiguousarray passes matching
+            # arrays through without a copy and converts everything else
+            # (lists, other dtypes, strided views) in a single pass.
+            waveformDataA = np.ascontiguousarray(waveformDataA, dtype=np.float64)
+            waveform_dataA_C = waveformDataA.ctypes.data_as(c_double_p)
+            length = len(waveformDataA)
 
             if waveformDataB is None:
                 waveform_dataB_C = ctypes.c_void_p(0)
             else:
-                if isinstance(waveformDataB, np.ndarray):
-                    waveform_dataB_C = waveformDataB.ctypes.data_as(c_double_p)
-                else:
-                    waveform_dataB_C = (ctypes.c_double * len(waveformDataB))(*waveformDataB)
-            # print('newFromArray DLL', length, type(waveform_dataA_C), type(waveform_dataB_C))
+                waveformDataB = np.ascontiguousarray(waveformDataB, dtype=np.float64)
+                waveform_dataB_C = waveformDataB.ctypes.data_as(c_double_p)
 
             wfm._SD_Object__handle = wfm._SD_Object__core_dll.SD_Wave_newFromArrayDouble(
                 waveformType, length, waveform_dataA_C, waveform_dataB_C)
@@ -27,6 +27,7 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 from enum import Enum
 from ctypes import *
 import numpy as np
+import os
 
 from core.module import Base
 from core.configoption import ConfigOption
@@ -101,6 +102,9 @@ ERROR_DICT = {
     20992: "DRV_NOT_AVAILABLE"
 }
 
+DRV_ACQUIRING = 20072
+DRV_IDLE = 20073
+
 
 class IxonUltra(Base, CameraInterface):
     """ Hardware class for Andors Ixon Ultra 897
@@ -116,7 +120,10 @@ class IxonUltra(Base, CameraInterface):
         default_cooler_on: True
         default_acquisition_mode: 'SINGLE_SCAN'
         default_trigger_mode: 'INTERNAL'
+        default_tracks: [[256, 10]] # optional, (centre, height) in pixel of each track
 
+    If default_tracks is given, these tracks are read out instead of using default_read_mode:
+    a single track in the SINGLE_TRACK, several tracks in the RANDOM_TRACK read mode.
     """
 
     _dll_location = ConfigOption('dll_location', missing='error')
@@ -126,6 +133,7 @@ class IxonUltra(Base, CameraInterface):
     _default_cooler_on = ConfigOption('default_cooler_on', True)
     _default_acquisition_mode = ConfigOption('default_acquisition_mode', 'SINGLE_SCAN')
     _default_trigger_mode = ConfigOption('default_trigger_mode', 'INTERNAL')
+    _default_tracks = ConfigOption('default_tracks', [])
 
     _exposure = _default_exposure
     _temperature = _default_temperature
@@ -144,6 +152,10 @@ class IxonUltra(Base, CameraInterface):
     _trigger_mode = _default_trigger_mode
     _scans = 1 #TODO get from camera
     _acquiring = False
+    _tracks = np.empty((0, 2), dtype=np.int32)  # (centre, height) of each track in pixel
+    _applied_read_mode = None  # read mode currently set on the camera, None if unknown
+    _data_buffer = np.zeros(0, dtype=np.int32)
+    _data_buffer_pointer = None
 
     def on_activate(self):
         """ Initialisation performed during activation of the module.
@@ -159,7 +171,11 @@ class IxonUltra(Base, CameraInterface):
         nx_px, ny_px = c_int(), c_int()
         self._get_detector(nx_px, ny_px)
         self._width, self._height = nx_px.value, ny_px.value
-        self._set_read_mode(self._read_mode)
+        self._applied_read_mode = None
+        if len(self._default_tracks) > 0:
+            self.set_tracks(self._default_tracks)
+        else:
+            self._set_read_mode(self._read_mode)
         self._set_trigger_mode(self._trigger_mode)
         self._set_exposuretime(self._exposure)
         self._set_acquisition_mode(self._acquisition_mode)
@@ -239,53 +255,75 @@ class IxonUltra(Base, CameraInterface):
         else:
             return False
 
-    def get_acquired_data(self):
+    def get_acquired_data(self, out=None):
         """ Return an array of last acquired image.
 
-        @return numpy array: image data in format [[row],[row]...]
+        @param numpy.ndarray out: optional, C-contiguous int32 array with as many elements as the
+                                  acquired data, into which the data is written directly.
+
+        @return numpy array: image data in format [[row],[row]...]. If out is given and the data
+                             could not be read, None is returned.
 
         Each pixel might be a float, integer or sub pixels
+
+        Without out, the dll writes into a persistent buffer and a copy of it is returned, so the
+        caller owns the array. With out, the data is written into out without any copy.
         """
 
         width = self._width
         height = self._height
 
+        # shape of a single scan, all the tracks are read out at once in the RANDOM_TRACK mode
         if self._read_mode == 'IMAGE':
-            if self._acquisition_mode == 'SINGLE_SCAN':
-                dim = width * height
-            elif self._acquisition_mode == 'KINETICS':
-                dim = width * height * self._scans
-            elif self._acquisition_mode == 'RUN_TILL_ABORT':
-                dim = width * height
-            else:
-                self.log.error('Your acquisition mode is not covered currently')
+            shape = (width, height)
         elif self._read_mode == 'SINGLE_TRACK' or self._read_mode == 'FVB':
-            if self._acquisition_mode == 'SINGLE_SCAN':
-                dim = width
-            elif self._acquisition_mode == 'KINETICS':
-                dim = width * self._scans
+            shape = (width, )
+        elif self._read_mode == 'RANDOM_TRACK':
+            shape = (len(self._tracks), width)
         else:
-            self.log.error('Your acquisition mode is not covered currently')
+            self.log.error('Your read mode is not covered currently')
+            return None
 
-        dim = int(dim)
-        image_array = np.zeros(dim)
-        cimage_array = c_int * dim
-        cimage = cimage_array()
+        if self._acquisition_mode == 'KINETICS':
+            shape = (self._scans, ) + shape
+        elif self._acquisition_mode not in ('SINGLE_SCAN', 'RUN_TILL_ABORT'):
+            self.log.error('Your acquisition mode is not covered currently')
+            return None
+        dim = int(np.prod(shape))
+
+        if out is not None:
+            if out.dtype != np.int32 or out.size != dim or not out.flags['C_CONTIGUOUS']:
+                self.log.error('Output array has to be a C-contiguous int32 array of {0} elements.'
+                               ''.format(dim))
+                return None
+            image_array = out
+            data_pointer = out.ctypes.data_as(POINTER(c_int))
+        else:
+            # the dll writes directly into a persistent buffer, only reallocated on size change
+            if self._data_buffer.size != dim:
+                self._data_buffer = np.zeros(dim, dtype=np.int32)
+                self._data_buffer_pointer = self._data_buffer.ctypes.data_as(POINTER(c_int))
+            image_array = self._data_buffer
+            data_pointer = self._data_buffer_pointer
 
         # this will be a bit hacky
         if self._acquisition_mode == 'RUN_TILL_ABORT':
-            error_code = self.dll.GetOldestImage(pointer(cimage), dim)
+            error_code = self.dll.GetOldestImage(data_pointer, dim)
         else:
-            error_code = self.dll.GetAcquiredData(pointer(cimage), dim)
+            error_code = self.dll.GetAcquiredData(data_pointer, dim)
         if ERROR_DICT[error_code] != 'DRV_SUCCESS':
             self.log.warning('Couldn\'t retrieve an image. {0}'.format(ERROR_DICT[error_code]))
+            if out is not None:
+                # the caller owns out and has to know that it holds no data
+                return None
+            image_array.fill(0)
         else:
-            self.log.debug('image length {0}'.format(len(cimage)))
-            for i in range(len(cimage)):
-                # could be problematic for 'FVB' or 'SINGLE_TRACK' readmode
-                image_array[i] = cimage[i]
+            self.log.debug('image length {0}'.format(dim))
 
-        image_array = np.reshape(image_array, (self._width, self._height))
+        image_array = np.reshape(image_array, shape)
+        if out is None:
+            # the buffer is overwritten by the next acquisition, hand out a copy
+            image_array = image_array.copy()
 
         self._cur_image = image_array
         return image_array
@@ -349,10 +387,97 @@ class IxonUltra(Base, CameraInterface):
         """
         status = c_int()
         self._get_status(status)
-        if ERROR_DICT[status.value] == 'DRV_IDLE':
-            return True
+        return status.value == DRV_IDLE
+
+# functions of this camera which are not part of the camera interface
+    def set_tracks(self, tracks):
+        """
+        Set the tracks to read out and switch to the matching read mode.
+
+        @param list tracks: list of (centre, height) tuples in pixel, one entry per track
+
+        @return int: error code (0:OK, -1:error)
+
+        A single track uses the SINGLE_TRACK read mode, several tracks are set in one go with the
+        RANDOM_TRACK read mode.
+        """
+        tracks = np.array(tracks, dtype=np.int32).reshape(-1, 2)
+        if len(tracks) == 0:
+            self.log.error('At least one track has to be given.')
+            return -1
+        if len(tracks) == 1:
+            mode = 'SINGLE_TRACK'
+            msg = self._set_single_track(*tracks[0])
         else:
-            return False
+            mode = 'RANDOM_TRACK'
+            msg = self._set_random_tracks(tracks)
+        if msg != 'DRV_SUCCESS':
+            return -1
+        return self._set_read_mode(mode)
+
+    def acquire_kinetic_series(self, number, out=None):
+        """ Acquire a series of scans with a single start of the acquisition.
+
+        @param int number: number of scans in the series
+        @param numpy.ndarray out: optional, int32 array the data is written to (see
+                                  get_acquired_data)
+
+        @return numpy array: data of all the scans, the first axis is the scan index, None on error
+
+        The camera is armed once for the whole series, which avoids the start/stop overhead of
+        calling start_single_acquisition and get_acquired_data for each scan.
+        """
+        previous_mode = self._acquisition_mode
+        if self._set_acquisition_mode('KINETICS') != 0:
+            self.log.error('Could not switch to the KINETICS acquisition mode.')
+            return None
+        data = None
+        if self._set_number_kinetics(number) == 'DRV_SUCCESS':
+            # start_single_acquisition returns -1 (truthy) in live mode, only True is a success
+            if self.start_single_acquisition() is True:
+                # WaitForAcquisition returns after the first scan, wait for the whole series
+                if self._wait_until_idle():
+                    data = self.get_acquired_data(out=out)
+                    if data is None:
+                        self.log.error('Kinetic series could not be read from the camera.')
+                else:
+                    self.log.error('Kinetic series acquisition did not finish.')
+            else:
+                self.log.error('Kinetic series acquisition could not be started.')
+        else:
+            self.log.error('Number of scans of the kinetic series could not be set.')
+        self._set_acquisition_mode(previous_mode)
+        return data
+
+    def record_kinetic_series(self, number, path):
+        """ Acquire a kinetic series directly into a memory mapped file.
+
+        @param int number: number of scans in the series
+        @param str path: file the raw int32 data is written to
+
+        @return numpy.memmap: the memory mapped data of all the scans, None on error
+
+        Long series do not need to fit into memory and are not copied again before saving. If the
+        acquisition fails, the partially written file is removed.
+        """
+        if self._read_mode == 'IMAGE':
+            shape = (number, self._width, self._height)
+        elif self._read_mode == 'RANDOM_TRACK':
+            shape = (number, len(self._tracks), self._width)
+        else:
+            shape = (number, self._width)
+        data = np.memmap(path, dtype=np.int32, mode='w+', shape=shape)
+        if self.acquire_kinetic_series(number, out=data) is None:
+            self.log.error('Kinetic series could not be recorded to {0}.'.format(path))
+            # release the mapping before the file can be removed
+            del data
+            try:
+                os.remove(path)
+            except OSError:
+                self.log.warning('Incomplete file {0} could not be removed.'.format(path))
+            return None
+        data.flush()
+        return data
 
 # soon to be interface functions for using
 # a camera as a part of a (slow) photon counter
@@ -427,6 +552,24 @@ class IxonUltra(Base, CameraInterface):
         self.dll.WaitForAcquisition()
         return ERROR_DICT[error_code]
 
+    def _wait_until_idle(self):
+        """ Block until the running acquisition has finished.
+
+        @return bool: True if the camera is idle, False if the status could not be read or shows
+                      an error
+
+        In the KINETICS mode WaitForAcquisition returns after each scan, so the status is checked
+        until the camera is idle. Each wait is limited to 100 ms, to never block on an acquisition
+        event which already passed.
+        """
+        status = c_int()
+        while True:
+            if self._get_status(status) != 'DRV_SUCCESS':
+                return False
+            if status.value != DRV_ACQUIRING:
+                return status.value == DRV_IDLE
+            self.dll.WaitForAcquisitionTimeOut(c_int(100))
+
 # setter functions
 
     def _set_shutter(self, typ, mode, closingtime, openingtime):
@@ -456,23 +599,32 @@ class IxonUltra(Base, CameraInterface):
         """
         @param string mode: string corresponding to certain ReadMode
         @return string answer from the camera
+
+        The camera is only addressed if the requested mode differs from the one already set.
         """
+        if mode == self._applied_read_mode:
+            return 0
+
         check_val = 0
 
-        if hasattr(ReadMode, mode):
-            n_mode = getattr(ReadMode, mode).value
-            n_mode = c_int(n_mode)
-            error_code = self.dll.SetReadMode(n_mode)
-            if mode == 'IMAGE':
-                self.log.debug("widt:{0}, height:{1}".format(self._width, self._height))
-                msg = self._set_image(1, 1, 1, self._width, 1, self._height)
-                if msg != 'DRV_SUCCESS':
-                    self.log.warning('{0}'.format(ERROR_DICT[error_code]))
+        try:
+            n_mode = ReadMode[mode].value
+        except KeyError:
+            self.log.error('Unknown read mode: {0}'.format(mode))
+            return -1
+
+        error_code = self.dll.SetReadMode(c_int(n_mode))
+        if mode == 'IMAGE':
+            self.log.debug("widt:{0}, height:{1}".format(self._width, self._height))
+            msg = self._set_image(1, 1, 1, self._width, 1, self._height)
+            if msg != 'DRV_SUCCESS':
+                self.log.warning('{0}'.format(msg))
         if ERROR_DICT[error_code] != 'DRV_SUCCESS':
             self.log.warning('Readmode was not set: {0}'.format(ERROR_DICT[error_code]))
             check_val = -1
         else:
             self._read_mode = mode
+            self._applied_read_mode = mode
 
         return check_val
 
@@ -526,6 +678,42 @@ class IxonUltra(Base, CameraInterface):
             self.log.error('Call to SetImage went wrong:{0}'.format(msg))
         return ERROR_DICT[error_code]
 
+    def _set_single_track(self, centre, height):
+        """
+        @param int centre: centre row of the track
+        @param int height: height of the track in rows
+
+        @return string: answer from the camera
+        """
+        error_code = self.dll.SetSingleTrack(c_int(int(centre)), c_int(int(height)))
+        msg = ERROR_DICT[error_code]
+        if msg == 'DRV_SUCCESS':
+            self._tracks = np.array([[centre, height]], dtype=np.int32)
+        else:
+            self.log.error('Call to SetSingleTrack went wrong:{0}'.format(msg))
+        return msg
+
+    def _set_random_tracks(self, tracks):
+        """
+        Set all the tracks of the RANDOM_TRACK read mode with a single call to the dll.
+
+        @param numpy.ndarray tracks: int32 array of shape (N, 2) with (centre, height) per track
+
+        @return string: answer from the camera
+
+        The dll expects a flat array [bottom0, top0, bottom1, top1, ...] of the (inclusive) rows.
+        """
+        areas = np.empty(2 * len(tracks), dtype=np.int32)
+        areas[0::2] = tracks[:, 0] - tracks[:, 1] // 2
+        areas[1::2] = areas[0::2] + tracks[:, 1] - 1
+        error_code = self.dll.SetRandomTracks(c_int(len(tracks)), areas.ctypes.data_as(POINTER(c_int)))
+        msg = ERROR_DICT[error_code]
+        if msg == 'DRV_SUCCESS':
+            self._tracks = tracks
+        else:
+            self.log.error('Call to SetRandomTracks went wrong:{0}'.format(msg))
+        return msg
+
     def _set_output_amplifier(self, typ):
         """
         @param c_int typ: 0: EMCCD gain, 1: Conventional CCD register
@@ -566,6 +754,19 @@ class IxonUltra(Base, CameraInterface):
 
         return check_val
 
+    def _set_number_kinetics(self, number):
+        """
+        @param int number: number of scans acquired in the KINETICS acquisition mode
+        @return string: answer from the camera
+        """
+        error_code = self.dll.SetNumberKinetics(c_int(number))
+        msg = ERROR_DICT[error_code]
+        if msg == 'DRV_SUCCESS':
+            self._scans = number
+        else:
+            self.log.error('Number of kinetic scans was not set: {0}'.format(msg))
+        return msg
+
     def _set_cooler(self, state):
         if state:
             error_code = self.dll.CoolerON()
@@ -642,7 +843,6 @@ class IxonUltra(Base, CameraInterface):
                 dim = width * self._scans
 
         dim = int(dim)
-        image_array = np.zeros(dim)
         cimage_array = c_int * dim
         cimage = cimage_array()
         error_code = self.dll.GetOldestImage(pointer(cimage), dim)
@@ -650,10 +850,9 @@ class IxonUltra(Base, CameraInterface):
             self.log.warning('Couldn\'t retrieve an image')
         else:
             self.log.debug('image length {0}'.format(len(cimage)))
-            for i in range(len(cimage)):
-                # could be problematic for 'FVB' or 'SINGLE_TRACK' readmode
-                image_array[i] = cimage[i]
 
+        # view on the ctypes buffer, which is freshly allocated on each call and stays zero on failure
+        image_array = np.frombuffer(cimage, dtype=np.int32)
         image_array = np.reshape(image_array, (int(self._width/self._hbin), int(self._height/self._vbin)))
         return image_array
 
@@ -738,7 +937,6 @@ class IxonUltra(Base, CameraInterface):
         dim = width * height * n_scans
 
         dim = int(dim)
-        image_array = np.zeros(dim)
         cimage_array = c_int * dim
         cimage = cimage_array()
 
@@ -751,11 +949,8 @@ class IxonUltra(Base, CameraInterface):
                                         size, byref(val_first), byref(val_last))
         if ERROR_DICT[error_code] != 'DRV_SUCCESS':
             self.log.warning('Couldn\'t retrieve an image. {0}'.format(ERROR_DICT[error_code]))
-        else:
-            for i in range(len(cimage)):
-                # could be problematic for 'FVB' or 'SINGLE_TRACK' readmode
-                image_array[i] = cimage[i]
 
+        image_array = np.frombuffer(cimage, dtype=np.int32)
         self._cur_image = image_array
         return image_array
 # non interface functions regarding setpoint interface
@@ -53,7 +53,13 @@ class CameraDummy(Base, CameraInterface):
     def on_activate(self):
         """ Initialisation performed during activation of the module.
         """
-        pass
+        # numpy < 1.17 has no random Generator, use the legacy functions there
+        if hasattr(np.random, 'default_rng'):
+            self._rng = np.random.default_rng()
+        else:
+            self._rng = None
+        # the noise buffer is allocated once and refilled on each acquisition
+        self._noise = np.empty((self._resolution[1], self._resolution[0]))
 
     def on_deactivate(self):
         """ Deinitialisation performed during deactivation of the module.
@@ -118,9 +124,14 @@ class CameraDummy(Base, CameraInterface):
         @return numpy array: image data in format [[row],[row]...]
 
         Each pixel might be a float, integer or sub pixels
+
+        Every call returns a new array, which the caller owns.
         """
-        data = np.random.random(self._resolution)*self._exposure*self._gain
-        return data.transpose()
+        if self._rng is not None:
+            noise = self._rng.random(out=self._noise)
+        else:
+            noise = np.random.random(self._noise.shape)
+        return noise * (self._exposure * self._gain)
 
     def set_exposure(self, exposure):
         """ Set the exposure time in seconds
@@ -196,6 +196,10 @@ class FastComtec(Base, FastCounterInterface):
         self.stopped_or_halt = "stopped"
         self.timetrace_tmp = []
 
+        # possible binwidths in seconds, one for each bitshift
+        self._hardware_binwidths = tuple(self.minimal_binwidth * 2 ** bitshift
+                                         for bitshift in range(25))
+
     def on_activate(self):
         """ Initialisation performed during activation of the module.
         """
@@ -250,8 +254,7 @@ class FastComtec(Base, FastCounterInterface):
 
         # the unit of those entries are seconds per bin. In order to get the
         # current binwidth in seonds use the get_binwidth method.
-        constraints['hardware_binwidth_list'] = list(self.minimal_binwidth * (2 ** np.array(
-                                                     np.linspace(0,24,25))))
+        constraints['hardware_binwidth_list'] = list(self._hardware_binwidths)
         constraints['max_sweep_len'] = 6.8
         constraints['max_bins'] = 6.8 /0.2e-9
         return constraints
@@ -31,12 +31,12 @@ which can be obtained directly from
     https://www.thorlabs.com/software_pages/ViewSoftwarePage.cfm?Code=APT
 """
 
-from collections import OrderedDict
-
 from core.module import Base
 from core.util.modules import get_home_dir
 from core.util.modules import get_main_dir
-from ctypes import c_long, c_buffer, c_float, windll, pointer
+import copy
+import ctypes
+from ctypes import c_long, c_int, c_buffer, c_float, c_char_p, byref, POINTER
 from interface.motor_interface import MotorInterface
 import os
 import platform
@@ -206,6 +206,19 @@ class APTMotor:
     #       associated digital input is fitted to your controller – see the
     #       relevant handbook for more details.
 
+    # (mask, description) pairs of the known status bits, to decode a status word in one pass
+    status_masks = [(1 << (bit - 1), desc) for bit, desc in sorted(status_code.items())]
+
+    # the states reported by get_status
+    status_dict = {0: 'magnet stopped', 1: 'magnet moves forward', 2: 'magnet moves backward'}
+
+    # faults of the status bits 15 to 20 (motion, instruction, interlock,
+    # temperature, bus voltage and commutation errors)
+    status_fault_mask = 0x000FC000
+
+    # the status word read by the last call of get_status
+    status_bits = 0
+
     def __init__(self, path_dll, serialnumber, hwtype, label='', unit='m'):
         """
         @param str path_dll: the absolute path to the dll of the current
@@ -219,7 +232,8 @@ class APTMotor:
                          degree
         """
 
-        self.aptdll = windll.LoadLibrary(path_dll)
+        self.aptdll = ctypes.windll.LoadLibrary(path_dll)
+        self._set_dll_prototypes()
         self.aptdll.EnableEventDlg(True)
         self.aptdll.APTInit()
         self._HWType = c_long(self.hwtype_dict[hwtype])
@@ -232,21 +246,88 @@ class APTMotor:
         # all apt stages are either in mm or in degree and
         # since mm is not an SI unit it has to be converted
         # here in this hardware file from m to mm.
+        self._set_unit(unit)
+
+        # hardware and stage axis information do not change unless set_stage_axis_info is called
+        self._hw_info = None
+        self._stage_axis_info = None
+
+        # output buffers reused by the frequently polled get_pos and get_status
+        self._position_buffer = c_float()
+        self._status_buffer = c_long()
+
+        # bind the DLL functions of the polling and moving path once
+        self._mot_get_position = self.aptdll.MOT_GetPosition
+        self._mot_get_status_bits = self.aptdll.MOT_GetStatusBits
+        self._mot_move_relative = self.aptdll.MOT_MoveRelativeEx
+        self._mot_move_absolute = self.aptdll.MOT_MoveAbsoluteEx
+        self._mot_stop_profiled = self.aptdll.MOT_StopProfiled
+
+    def _set_unit(self, unit):
+        """ Set the unit of the axis and the factor to convert it to the device unit.
+
+        @param str unit: 'm' or 'meter' for linear axes (device works in mm),
+                         anything else (e.g. '°' or 'degree') for rotation axes.
+        """
         self._unit = unit
+        self._unit_factor = 1000.0 if unit in ('m', 'meter') else 1.0
+        # cached velocity parameters are only valid for the unit they were read in
+        self._velocity_parameters = None
+
+    def _set_dll_prototypes(self):
+        """ Declare the argument and return types of the used APT.dll functions.
+
+        With the prototypes known, ctypes does not have to guess the argument
+        conversion on each call and plain python numbers can be passed.
+        The signatures are taken from the APT server header APTAPI.h, every
+        function returns a long error code and a BOOL is a C int.
+        """
+        p_long = POINTER(c_long)
+        p_float = POINTER(c_float)
+        prototypes = {
+            'APTInit': [],
+            'APTCleanUp': [],
+            'EnableEventDlg': [c_int],
+            'GetNumHWUnitsEx': [c_long, p_long],
+            'GetHWSerialNumEx': [c_long, c_long, p_long],
+            'GetHWInfo': [c_long, c_char_p, c_long, c_char_p, c_long, c_char_p, c_long],
+            'InitHWDevice': [c_long],
+            'MOT_GetStageAxisInfo': [c_long, p_float, p_float, p_long, p_float],
+            'MOT_SetStageAxisInfo': [c_long, c_float, c_float, c_long, c_float],
+            'MOT_GetHWLimSwitches': [c_long, p_long, p_long],
+            'MOT_SetHWLimSwitches': [c_long, c_long, c_long],
+            'MOT_GetVelParams': [c_long, p_float, p_float, p_float],
+            'MOT_SetVelParams': [c_long, c_float, c_float, c_float],
+            'MOT_GetVelParamLimits': [c_long, p_float, p_float],
+            'MOT_GetHomeParams': [c_long, p_long, p_long, p_float, p_float],
+            'MOT_SetHomeParams': [c_long, c_long, c_long, c_float, c_float],
+            'MOT_GetPosition': [c_long, p_float],
+            'MOT_MoveRelativeEx': [c_long, c_float, c_int],
+            'MOT_MoveAbsoluteEx': [c_long, c_float, c_int],
+            'MOT_GetStatusBits': [c_long, p_long],
+            'MOT_Identify': [c_long],
+            'MOT_StopProfiled': [c_long],
+            'MOT_SetBLashDist': [c_long, c_float],
+            'MOT_GetBLashDist': [c_long, p_float],
+        }
+        for name, argtypes in prototypes.items():
+            func = getattr(self.aptdll, name)
+            func.argtypes = argtypes
+            func.restype = c_long
 
     def getNumberOfHardwareUnits(self):
         """ Returns the number of connected external hardware (HW) units that
             are available to be interfaced.
         """
         numUnits = c_long()
-        self.aptdll.GetNumHWUnitsEx(self._HWType, pointer(numUnits))
+        self.aptdll.GetNumHWUnitsEx(self._HWType, byref(numUnits))
         return numUnits.value
 
     def getSerialNumberByIdx(self, index):
         """ Returns the Serial Number of the specified index """
         HWSerialNum = c_long()
         hardwareIndex = c_long(index)
-        self.aptdll.GetHWSerialNumEx(self._HWType, hardwareIndex, pointer(HWSerialNum))
+        self.aptdll.GetHWSerialNumEx(self._HWType, hardwareIndex, byref(HWSerialNum))
         return HWSerialNum
 
     def setSerialNumber(self, SerialNum):
@@ -256,6 +337,10 @@ class APTMotor:
         if self.verbose:
             print("Serial is", SerialNum)
         self.SerialNum = c_long(SerialNum)
+        # cached device information belongs to the previous serial number
+        self._hw_info = None
+        self._stage_axis_info = None
+        self._velocity_parameters = None
         return self.SerialNum.value
 
     def initializeHardwareDevice(self):
@@ -281,12 +366,13 @@ class APTMotor:
 
     def getHardwareInformation(self):
         """ Get information from the hardware"""
-        model = c_buffer(255)
-        softwareVersion = c_buffer(255)
-        hardwareNotes = c_buffer(255)
-        self.aptdll.GetHWInfo(self.SerialNum, model, 255, softwareVersion, 255, hardwareNotes, 255)
-        hwinfo = [model.value, softwareVersion.value, hardwareNotes.value]
-        return hwinfo
+        if self._hw_info is None:
+            model = c_buffer(255)
+            softwareVersion = c_buffer(255)
+            hardwareNotes = c_buffer(255)
+            self.aptdll.GetHWInfo(self.SerialNum, model, 255, softwareVersion, 255, hardwareNotes, 255)
+            self._hw_info = [model.value, softwareVersion.value, hardwareNotes.value]
+        return list(self._hw_info)
 
     def get_stage_axis_info(self):
         """ Get parameter configuration of the stage
@@ -301,28 +387,28 @@ class APTMotor:
                                      the stepper motor.
 
         This method will handle the conversion to the non SI unit mm.
+        The values are read from the device only once and cached until
+        set_stage_axis_info is called.
         """
+        if self._stage_axis_info is not None:
+            return list(self._stage_axis_info)
+
         minimumPosition = c_float()
         maximumPosition = c_float()
         units = c_long()
         pitch = c_float()
         self.aptdll.MOT_GetStageAxisInfo(self.SerialNum,
-                                         pointer(minimumPosition),
-                                         pointer(maximumPosition),
-                                         pointer(units),
-                                         pointer(pitch))
-
-        if self._unit == 'm':
-            stageAxisInformation = [minimumPosition.value / 1000.0,
-                                    maximumPosition.value / 1000.0,
-                                    units.value,
-                                    pitch.value]
-        else:
-            stageAxisInformation = [minimumPosition.value,
-                                    maximumPosition.value,
-                                    units.value,
-                                    pitch.value]
-        return stageAxisInformation
+                                         byref(minimumPosition),
+                                         byref(maximumPosition),
+                                         byref(units),
+                                         byref(pitch))
+
+        stageAxisInformation = [minimumPosition.value / self._unit_factor,
+                                maximumPosition.value / self._unit_factor,
+                                units.value,
+                                pitch.value]
+        self._stage_axis_info = stageAxisInformation
+        return list(stageAxisInformation)
 
     def set_stage_axis_info(self, pos_min, pos_max, pitch, unit=1):
         """ Set parameter configuration of the stage.
@@ -339,30 +425,26 @@ class APTMotor:
         This method will handle the conversion to the non SI unit mm.
         """
         if unit == 1:
-            self._unit = 'm'
+            self._set_unit('m')
         elif unit == 2:
-            self._unit = 'degree'
+            self._set_unit('degree')
         else:
             raise Exception('The unit in method set_stage_axis_info is invalid! '
                             'Use either 1 (= in m) or 2 (= degree)!')
 
-        if self._unit == 'm':
-            # the thorlabs stage takes just mm values, that is really a pity...
-            pos_min_c = c_float(pos_min * 1000)
-            pos_max_c = c_float(pos_max * 1000)
-        else:
-            pos_min_c = c_float(pos_min)
-            pos_max_c = c_float(pos_max)
-        unit_c = c_long(unit)  # units of mm
+        # the thorlabs stage takes just mm values, that is really a pity...
         # Get different pitches of lead screw for moving stages for different stages.
-        pitch_c = c_float(pitch)
-        self.aptdll.MOT_SetStageAxisInfo(self.SerialNum, pos_min_c, pos_max_c,
-                                         unit_c, pitch_c)
+        self.aptdll.MOT_SetStageAxisInfo(self.SerialNum,
+                                         pos_min * self._unit_factor,
+                                         pos_max * self._unit_factor,
+                                         unit,
+                                         pitch)
+        self._stage_axis_info = None
 
     def getHardwareLimitSwitches(self):
         reverseLimitSwitch = c_long()
         forwardLimitSwitch = c_long()
-        self.aptdll.MOT_GetHWLimSwitches(self.SerialNum, pointer(reverseLimitSwitch), pointer(forwardLimitSwitch))
+        self.aptdll.MOT_GetHWLimSwitches(self.SerialNum, byref(reverseLimitSwitch), byref(forwardLimitSwitch))
         hardwareLimitSwitches = [reverseLimitSwitch.value, forwardLimitSwitch.value]
         return hardwareLimitSwitches
 
@@ -380,10 +462,8 @@ class APTMotor:
         0x05 or 5: Switch breaks on contact - only used for homes (e.g. limit switched rotations stages).
         0x06 or 6: For PMD based brushless servo controllers only - uses index mark for homing.
         """
-        reverseLimitSwitch = c_long(switch_reverse)
-        forwardLimitSwitch = c_long(switch_forward)
-        self.aptdll.MOT_SetHWLimSwitches(self.SerialNum, reverseLimitSwitch, forwardLimitSwitch)
-        hardwareLimitSwitches = [reverseLimitSwitch.value, forwardLimitSwitch.value]
+        self.aptdll.MOT_SetHWLimSwitches(self.SerialNum, switch_reverse, switch_forward)
+        hardwareLimitSwitches = [switch_reverse, switch_forward]
         return hardwareLimitSwitches
 
     def getVelocityParameters(self):
@@ -397,23 +477,33 @@ class APTMotor:
         minimumVelocity = c_float()
         acceleration = c_float()
         maximumVelocity = c_float()
-        self.aptdll.MOT_GetVelParams(self.SerialNum, pointer(minimumVelocity), pointer(acceleration), pointer(maximumVelocity))
-        if self._unit == 'm':
-            # the thorlabs stage return a the values in mm/s or mm/s^2, that is really a pity...
-            velocityParameters = [minimumVelocity.value / 1000.0,
-                                  acceleration.value / 1000.0,
-                                  maximumVelocity.value / 1000.0]
-        else:
-            velocityParameters = [minimumVelocity.value, acceleration.value,
-                                  maximumVelocity.value]
-        return velocityParameters
+        self.aptdll.MOT_GetVelParams(self.SerialNum, byref(minimumVelocity), byref(acceleration), byref(maximumVelocity))
+        # the thorlabs stage return a the values in mm/s or mm/s^2, that is really a pity...
+        velocityParameters = [minimumVelocity.value / self._unit_factor,
+                              acceleration.value / self._unit_factor,
+                              maximumVelocity.value / self._unit_factor]
+        self._velocity_parameters = velocityParameters
+        return list(velocityParameters)
+
+    def _get_cached_velocity_parameters(self):
+        """ Return the last set or read velocity parameters, ask the device only if none are known.
+
+        @return list: min_vel, curr_acc, max_vel as in getVelocityParameters
+        """
+        if self._velocity_parameters is None:
+            return self.getVelocityParameters()
+        return list(self._velocity_parameters)
 
     def get_velocity(self):
         """ Get the current velocity setting
+
+        The value last set through this class is returned, the device is only
+        asked if nothing is known yet. Use getVelocityParameters to read back
+        the values from the device.
         """
         if self.verbose:
             print('get_velocity probing...')
-        minVel, acc, maxVel = self.getVelocityParameters()
+        minVel, acc, maxVel = self._get_cached_velocity_parameters()
         if self.verbose:
             print('get_velocity maxVel')
         return maxVel
@@ -432,16 +522,12 @@ class APTMotor:
         Note: The minVel parameter value is locked at zero and cannot be
               adjusted.
         """
-        if self._unit == 'm':
-            minimumVelocity = c_float(minVel * 1000.0)
-            acceleration = c_float(acc * 1000.0)
-            maximumVelocity = c_float(maxVel * 1000.0)
-        else:
-            minimumVelocity = c_float(minVel)
-            acceleration = c_float(acc)
-            maximumVelocity = c_float(maxVel)
-
-        self.aptdll.MOT_SetVelParams(self.SerialNum, minimumVelocity, acceleration, maximumVelocity)
+        # the prototype of MOT_SetVelParams converts the plain floats
+        self.aptdll.MOT_SetVelParams(self.SerialNum,
+                                     minVel * self._unit_factor,
+                                     acc * self._unit_factor,
+                                     maxVel * self._unit_factor)
+        self._velocity_parameters = [minVel, acc, maxVel]
 
     def set_velocity(self, maxVel):
         """ Set the maximal velocity for the motor movement.
@@ -450,7 +536,7 @@ class APTMotor:
         """
         if self.verbose:
             print('set_velocity', maxVel)
-        minVel, acc, oldVel = self.getVelocityParameters()
+        minVel, acc, oldVel = self._get_cached_velocity_parameters()
         self.setVelocityParameters(minVel, acc, maxVel)
 
     def getVelocityParameterLimits(self):
@@ -463,14 +549,10 @@ class APTMotor:
 
         maximumAcceleration = c_float()
         maximumVelocity = c_float()
-        self.aptdll.MOT_GetVelParamLimits(self.SerialNum, pointer(maximumAcceleration), pointer(maximumVelocity))
+        self.aptdll.MOT_GetVelParamLimits(self.SerialNum, byref(maximumAcceleration), byref(maximumVelocity))
 
-        if self._unit == 'm':
-            velocityParameterLimits = [maximumAcceleration.value / 1000.0,
-                                       maximumVelocity.value / 1000.0]
-        else:
-            velocityParameterLimits = [maximumAcceleration.value,
-                                       maximumVelocity.value]
+        velocityParameterLimits = [maximumAcceleration.value / self._unit_factor,
+                                   maximumVelocity.value / self._unit_factor]
         return velocityParameterLimits
 
         # Controlling the motors:
@@ -488,10 +570,10 @@ class APTMotor:
         limit_switch = c_long()
         home_velocity = c_float()
         zero_offset = c_float()
-        self.aptdll.MOT_GetHomeParams(self.SerialNum, pointer(home_direction),
-                                      pointer(limit_switch),
-                                      pointer(home_velocity),
-                                      pointer(zero_offset))
+        self.aptdll.MOT_GetHomeParams(self.SerialNum, byref(home_direction),
+                                      byref(limit_switch),
+                                      byref(home_velocity),
+                                      byref(zero_offset))
 
         home_param = [home_direction.value, limit_switch.value,
                       home_velocity.value, zero_offset.value]
@@ -511,12 +593,8 @@ class APTMotor:
                                   the limit switch from the Home position.
 
         """
-        home_dir_c = c_long(home_dir)
-        switch_dir_c = c_long(switch_dir)
-        home_vel_c = c_float(home_vel)
-        zero_offset_c = c_float(zero_offset)
-        self.aptdll.MOT_SetHomeParams(self.SerialNum, home_dir_c, switch_dir_c,
-                                      home_vel_c, zero_offset_c)
+        self.aptdll.MOT_SetHomeParams(self.SerialNum, home_dir, switch_dir,
+                                      home_vel, zero_offset)
 
         return True
 
@@ -531,17 +609,12 @@ class APTMotor:
         if not self.Connected:
             raise Exception('Please connect first! Use initializeHardwareDevice')
 
-        position = c_float()
-        self.aptdll.MOT_GetPosition(self.SerialNum, pointer(position))
+        position = self._position_buffer
+        self._mot_get_position(self.SerialNum, byref(position))
 
-        if self._unit == 'm':
-            if self.verbose:
-                print('getPos (m)', position.value / 1000.0)
-            return position.value / 1000.0
-        else:
-            if self.verbose:
-                print('getPos (degree)', position.value)
-            return position.value
+        if self.verbose:
+            print('getPos ({0})'.format(self._unit), position.value / self._unit_factor)
+        return position.value / self._unit_factor
 
     def move_rel(self, relDistance):
         """ Moves the motor a relative distance specified
@@ -554,12 +627,7 @@ class APTMotor:
             # TODO: This should use our error message system
             print('Please connect first! Use initializeHardwareDevice')
 
-        if self._unit == 'm':
-            relativeDistance = c_float(relDistance * 1000.0)
-        else:
-            relativeDistance = c_float(relDistance)
-
-        self.aptdll.MOT_MoveRelativeEx(self.SerialNum, relativeDistance, self._wait_until_done)
+        self._mot_move_relative(self.SerialNum, relDistance * self._unit_factor, self._wait_until_done)
         if self.verbose:
             print('move_rel SUCESS')
 
@@ -573,12 +641,7 @@ class APTMotor:
         if not self.Connected:
             raise Exception('Please connect first! Use initializeHardwareDevice')
 
-        if self._unit == 'm':
-            absolutePosition = c_float(absPosition * 1000.0)
-        else:
-            absolutePosition = c_float(absPosition)
-
-        self.aptdll.MOT_MoveAbsoluteEx(self.SerialNum, absolutePosition, self._wait_until_done)
+        self._mot_move_absolute(self.SerialNum, absPosition * self._unit_factor, self._wait_until_done)
         if self.verbose:
             print('move_abs SUCESS')
         return True
@@ -614,7 +677,7 @@ class APTMotor:
         if not self.Connected:
             raise Exception('Please connect first! Use initializeHardwareDevice')
         # Save velocities to reset after move
-        minVel, acc, maxVel = self.getVelocityParameters()
+        minVel, acc, maxVel = self._get_cached_velocity_parameters()
         # Set new desired max velocity
         self.set_velocity(moveVel)
         self.move_rel(absPosition)
@@ -628,18 +691,16 @@ class APTMotor:
 
         @param float relDistance: Relative position desired in m or in degree
 
-        NOTE: Be careful in using this method. If interactive mode is on, then
-              the stage reacts immediately on both input for the relative
-              movement, which prevents the proper execution of the first
-              command!
+        The backlash correction is done by the controller itself with the
+        distance passed to set_backlash, so a single relative move is issued
+        instead of an overshooting move followed by the approach move.
         """
         if self.verbose:
             print('mbRel ', relDistance, c_float(relDistance))
         if not self.Connected:
             # TODO: This should use our error message system
             print('Please connect first! Use initializeHardwareDevice')
-        self.move_rel(relDistance - self._backlash)
-        self.move_rel(self._backlash)
+        self.move_rel(relDistance)
         if self.verbose:
             print('mbRel SUCESS')
         return True
@@ -668,9 +729,7 @@ class APTMotor:
         """ Extract from the status integer all possible states.
         "return:
         """
-        status = {0: 'magnet stopped', 1: 'magnet moves forward', 2: 'magnet moves backward'}
-
-        return status
+        return self.status_dict
 
     def get_status(self):
         """ Get the status bits of the current axis.
@@ -679,17 +738,27 @@ class APTMotor:
                                   dictionary explaining the current status.
         """
 
-        status_bits = c_long()
-        self.aptdll.MOT_GetStatusBits(self.SerialNum, pointer(status_bits))
-
-        # Check at least whether magnet is moving:
+        status_bits = self._status_buffer
+        self._mot_get_status_bits(self.SerialNum, byref(status_bits))
+        self.status_bits = status_bits.value
 
-        if self._test_bit(status_bits.value, 4):
-            return 1, self._create_status_dict()
-        elif self._test_bit(status_bits.value, 5):
-            return 2, self._create_status_dict()
+        # Check at least whether magnet is moving (bit 5 forward, bit 6 reverse):
+        moving = status_bits.value & 0x30
+        if moving & 0x10:
+            return 1, self.status_dict
+        elif moving & 0x20:
+            return 2, self.status_dict
         else:
-            return 0, self._create_status_dict()
+            return 0, self.status_dict
+
+    def decode_status(self, status_bits):
+        """ Translate a status word into the descriptions of all set bits.
+
+        @param int status_bits: the 32 bit status word as returned by the device
+
+        @return list: descriptions (see status_code) of all bits set in status_bits
+        """
+        return [desc for mask, desc in self.status_masks if status_bits & mask]
 
     def identify(self):
         """ Causes the motor to blink the Active LED. """
@@ -704,7 +773,7 @@ class APTMotor:
 
     def abort(self):
         """ Abort the movement. """
-        self.aptdll.MOT_StopProfiled(self.SerialNum)
+        self._mot_stop_profiled(self.SerialNum)
 
     def go_home(self):
 
@@ -734,13 +803,8 @@ class APTMotor:
         @param float backlash: the backlash in m or degree for the used stage.
         """
 
-        if self._unit == 'm':
-            # controller needs values in mm:
-            c_backlash = c_float(backlash * 1000)
-        else:
-            c_backlash = c_float(backlash)
-
-        self.aptdll.MOT_SetBLashDist(self.SerialNum, c_backlash)
+        # controller needs values in mm:
+        self.aptdll.MOT_SetBLashDist(self.SerialNum, backlash * self._unit_factor)
 
         self._backlash = backlash
         return backlash
@@ -751,12 +815,9 @@ class APTMotor:
         @return float: backlash in m or degree, depending on the axis config.
         """
         backlash = c_float()
-        self.aptdll.MOT_GetBLashDist(self.SerialNum, pointer(backlash))
+        self.aptdll.MOT_GetBLashDist(self.SerialNum, byref(backlash))
 
-        if self._unit == 'm':
-            self._backlash = backlash.value / 1000
-        else:
-            self._backlash = backlash.value
+        self._backlash = backlash.value / self._unit_factor
 
         return self._backlash
 # ==============================================================================
@@ -874,11 +935,15 @@ class APTStage(Base, MotorInterface):
             )
 
         # The references to the different axis are stored in this dictionary:
-        self._axis_dict = OrderedDict()
+        self._axis_dict = {}
 
         hw_conf_dict = self._get_config()
 
-        limits_dict = self.get_constraints()
+        # the constraints are taken from the config and do not change while the module is active
+        self._constraints = self._read_constraints()
+        # fault bits of each axis as last reported, see _log_axis_faults
+        self._axis_faults = {}
+        limits_dict = self._constraints
 
         for axis_label in axis_label_list:
             serialnumber = hw_conf_dict[axis_label]['serial_num']
@@ -932,8 +997,8 @@ class APTStage(Base, MotorInterface):
         """ Disconnect from hardware and clean up.
         """
 
-        for label_axis in self._axis_dict:
-            self._axis_dict[label_axis].cleanUpAPT()
+        for axis in self._axis_dict.values():
+            axis.cleanUpAPT()
 
     def get_constraints(self):
         """ Retrieve the hardware constrains from the motor device.
@@ -957,6 +1022,13 @@ class APTStage(Base, MotorInterface):
         insert just None. If you are not sure about the meaning, look in other
         hardware files to get an impression.
         """
+        return copy.deepcopy(self._constraints)
+
+    def _read_constraints(self):
+        """ Assemble the constraints of all axes from the config file.
+
+        @return dict: constraints as described in get_constraints
+        """
         constraints = {}
 
         config = self.getConfiguration()
@@ -971,7 +1043,7 @@ class APTStage(Base, MotorInterface):
             if 'constraints' in axisconfig:
                 constraintsconfig = axisconfig['constraints']
             else:
-                constraintsconfig = OrderedDict()
+                constraintsconfig = {}
 
             # Now we can read through these axisconstraints
 
@@ -1058,10 +1130,11 @@ class APTStage(Base, MotorInterface):
 
         A smart idea would be to ask the position after the movement.
         """
-        curr_pos_dict = self.get_pos()
-        constraints = self.get_constraints()
+        # only ask the axes which are actually moved for their position
+        curr_pos_dict = self.get_pos(param_list=[label for label in param_dict if label in self._axis_dict])
+        constraints = self._constraints
 
-        for label_axis in self._axis_dict:
+        for label_axis, axis in self._axis_dict.items():
 
             if param_dict.get(label_axis) is not None:
                 move = param_dict[label_axis]
@@ -1084,7 +1157,7 @@ class APTStage(Base, MotorInterface):
                                      )
                 else:
                     self._save_pos({label_axis: curr_pos + move})
-                    self._axis_dict[label_axis].move_rel(move)
+                    axis.move_rel(move)
 
     def move_abs(self, param_dict):
         """ Moves stage to absolute position (absolute movement)
@@ -1096,9 +1169,9 @@ class APTStage(Base, MotorInterface):
                                  to one of the axis.
         A smart idea would be to ask the position after the movement.
         """
-        constraints = self.get_constraints()
+        constraints = self._constraints
 
-        for label_axis in self._axis_dict:
+        for label_axis, axis in self._axis_dict.items():
             if param_dict.get(label_axis) is not None:
                 desired_pos = param_dict[label_axis]
 
@@ -1113,13 +1186,13 @@ class APTStage(Base, MotorInterface):
                     )
                 else:
                     self._save_pos({label_axis: desired_pos})
-                    self._axis_dict[label_axis].move_abs(desired_pos)
+                    axis.move_abs(desired_pos)
 
     def abort(self):
         """ Stops movement of the stage. """
 
-        for label_axis in self._axis_dict:
-            self._axis_dict[label_axis].abort()
+        for axis in self._axis_dict.values():
+            axis.abort()
 
         self.log.warning('Movement of all the axis aborted! Stage stopped.')
 
@@ -1144,8 +1217,8 @@ class APTStage(Base, MotorInterface):
                 if label_axis in self._axis_dict:
                     pos[label_axis] = self._axis_dict[label_axis].get_pos()
         else:
-            for label_axis in self._axis_dict:
-                pos[label_axis] = self._axis_dict[label_axis].get_pos()
+            for label_axis, axis in self._axis_dict.items():
+                pos[label_axis] = axis.get_pos()
 
         return pos
 
@@ -1167,11 +1240,26 @@ class APTStage(Base, MotorInterface):
                 if label_axis in self._axis_dict:
                     status[label_axis] = self._axis_dict[label_axis].get_status()
         else:
-            for label_axis in self._axis_dict:
-                status[label_axis] = self._axis_dict[label_axis].get_status()
+            for label_axis, axis in self._axis_dict.items():
+                status[label_axis] = axis.get_status()
 
+        self._log_axis_faults(status)
         return status
 
+    def _log_axis_faults(self, axis_labels):
+        """ Log the faults in the status words read last, once whenever they change.
+
+        @param iterable axis_labels: labels of the axes whose status was just read
+        """
+        for label_axis in axis_labels:
+            axis = self._axis_dict[label_axis]
+            faults = axis.status_bits & axis.status_fault_mask
+            if faults != self._axis_faults.get(label_axis, 0):
+                self._axis_faults[label_axis] = faults
+                if faults:
+                    self.log.warning('Axis {0} reports a fault:\n{1}'.format(
+                        label_axis, '\n'.join(axis.decode_status(faults))))
+
     def calibrate(self, param_list=None):
         """ Calibrates the stage.
 
@@ -1198,8 +1286,8 @@ class APTStage(Base, MotorInterface):
                 if label_axis in self._axis_dict:
                     self._axis_dict[label_axis].go_home()
         else:
-            for label_axis in self._axis_dict:
-                self._axis_dict[label_axis].go_home()
+            for axis in self._axis_dict.values():
+                axis.go_home()
 
     # TODO: This seems to relate specifically to magnet applications, maybe should move
     def _save_pos(self, param_dict):
@@ -1254,8 +1342,8 @@ class APTStage(Base, MotorInterface):
                 if label_axis in self._axis_dict:
                     vel[label_axis] = self._axis_dict[label_axis].get_velocity()
         else:
-            for label_axis in self._axis_dict:
-                vel[label_axis] = self._axis_dict[label_axis].get_velocity()
+            for label_axis, axis in self._axis_dict.items():
+                vel[label_axis] = axis.get_velocity()
 
         return vel
 
@@ -1268,7 +1356,7 @@ class APTStage(Base, MotorInterface):
                                  'axis_label' must correspond to a label given
                                  to one of the axis.
         """
-        constraints = self.get_constraints()
+        constraints = self._constraints
 
         for label_axis in param_dict:
             if label_axis in self._axis_dict:
@@ -1282,8 +1370,8 @@ class APTStage(Base, MotorInterface):
                         'exceeds the limts [{2},{3}] ! Command is ignored!'
                         ''.format(label_axis, desired_vel, constr['vel_min'], constr['vel_max'])
                     )
-            else:
-                self._axis_dict[label_axis].set_velocity(desired_vel)
+                else:
+                    self._axis_dict[label_axis].set_velocity(desired_vel)
 
     def _get_config(self):
         """ Get the HW information about the APT motors from the config file
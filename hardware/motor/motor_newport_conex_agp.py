@@ -69,6 +69,9 @@ class MotorNewportConexAGP(Base, MotorInterface):
     def on_activate(self):
         """ Initialisation performed during activation of the module.
         """
+        # every command starts with the two digit controller address
+        self._address_prefix = '{0:02d}'.format(self._controller_address).encode('ascii')
+
         self._serial_connection = serial.Serial(
             port=self._com_port,
             baudrate=921600,
@@ -103,7 +106,7 @@ class MotorNewportConexAGP(Base, MotorInterface):
 
             @return str: answer from controller
         """
-        cmd = '{0:02d}{1:s}?\r\n'.format(self._controller_address, command).encode('ascii')
+        cmd = self._address_prefix + command.encode('ascii') + b'?\r\n'
         self._serial_connection.write(cmd)
         ret = self._serial_connection.read_until(b'\r\n')
         if cmd[0:4] != ret[0:4]:
@@ -117,7 +120,7 @@ class MotorNewportConexAGP(Base, MotorInterface):
         @param command: two-letter command/variable for controller
         @param value: value to write to controller
         """
-        cmd = '{0:02d}{1:s}{2}\r\n'.format(self._controller_address, command, value).encode('ascii')
+        cmd = self._address_prefix + '{0:s}{1}\r\n'.format(command, value).encode('ascii')
         self._serial_connection.write(cmd)
 
     def write(self, command):
@@ -125,7 +128,7 @@ class MotorNewportConexAGP(Base, MotorInterface):
 
         @param command: two-letter command for controller
         """
-        cmd = '{0:02d}{1:s}\r\n'.format(self._controller_address, command).encode('ascii')
+        cmd = self._address_prefix + command.encode('ascii') + b'\r\n'
         self._serial_connection.write(cmd)
 
     def read(self):
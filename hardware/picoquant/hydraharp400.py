@@ -84,6 +84,10 @@ class HydraHarp400(Base, FastCounterInterface):
         self._set_constants()
         self.connected_to_device = False
 
+        # possible binwidths in seconds, one for each binning code
+        self._hardware_binwidths = tuple(self.minimal_binwidth * 2 ** binning
+                                         for binning in range(self.BINSTEPSMAX))
+
         self.log.debug('The following configuration was found.')
 
         # checking for the right configuration
@@ -93,6 +97,14 @@ class HydraHarp400(Base, FastCounterInterface):
         self.stopped_or_halt = "stopped"
         self.bins_num = 0
 
+        # histogram buffer large enough for any histogram length, refilled by
+        # every call of get_data_trace
+        self._histogram = np.zeros((self.HISTCHAN,), dtype=np.uint32)
+        self._histogram_ptr = self._histogram.ctypes.data_as(ctypes.POINTER(ctypes.c_uint32))
+        # output arguments of the getters which are polled during a measurement
+        self._elapsed_time = ctypes.c_double()
+        self._ctcstatus = ctypes.c_int32()
+
     def on_activate(self):
         """ Initialisation performed during activation of the module.
         """
@@ -194,8 +206,7 @@ class HydraHarp400(Base, FastCounterInterface):
         # the unit of those entries are seconds per bin. In order to get the
         # current binwidth in seonds use the get_binwidth method.
 
-        constraints['hardware_binwidth_list'] = list(self.minimal_binwidth * (2 ** np.array(
-                                                     np.linspace(0, 25, 26))))
+        constraints['hardware_binwidth_list'] = list(self._hardware_binwidths)
         constraints['max_sweep_len'] = 2.199 # Page 51 in user manual
         constraints['max_bins'] = 65536
         return constraints
@@ -284,17 +295,14 @@ class HydraHarp400(Base, FastCounterInterface):
             returnarray[gate_index, timebin_index]
         @return arrray: Time trace.
         """
-        py_counts = np.empty((self.bins_num,), dtype=np.uint32)
-        pointer = ctypes.POINTER(ctypes.c_uint32)
-        c_counts = py_counts.ctypes.data_as(pointer)
-
         if self.is_gated():
             pass
             # TODO implement
         else:
-            self.tryfunc(self.dll.HH_GetHistogram(self._deviceID, c_counts, 1, 0), "GetHistogram")
+            self.tryfunc(self.dll.HH_GetHistogram(self._deviceID, self._histogram_ptr, 1, 0),
+                         "GetHistogram")
 
-        time_trace = np.int64(py_counts)
+        time_trace = self._histogram[:self.bins_num].astype(np.int64)
 
         meas_t = int(self.get_measurement_time())
         info_dict = {'elapsed_sweeps': None,
@@ -302,7 +310,7 @@ class HydraHarp400(Base, FastCounterInterface):
         return time_trace, info_dict
 
     def get_measurement_time(self):
-        t = ctypes.c_double()  # in ms unit
+        t = self._elapsed_time  # in ms unit
         self.dll.HH_GetElapsedMeasTime(self._deviceID, ctypes.byref(t))
         return t.value/1000 # return in second
 
@@ -460,7 +468,7 @@ class HydraHarp400(Base, FastCounterInterface):
         @return int:  = 0: acquisition time still running
                       > 0: acquisition time has ended, measurement finished.
         """
-        ctcstatus = ctypes.c_int32()
+        ctcstatus = self._ctcstatus
         self.check(self.dll.HH_CTCStatus(self._deviceID, ctypes.byref(ctcstatus)))
         return ctcstatus.value
 
@@ -21,6 +21,7 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 
 import ctypes
 import numpy as np
+import os
 import time
 from qtpy import QtCore
 
@@ -105,8 +106,10 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
     _deviceID = ConfigOption('deviceID', 0, missing='warn') # a device index from 0 to 7.
     _mode = ConfigOption('mode', 0, missing='warn')
 
+    # errorcodes parsed from errorcodes.h, shared by all instances
+    _errorcode = None
+
     sigReadoutPicoharp = QtCore.Signal()
-    sigAnalyzeData = QtCore.Signal(object, object)
     sigStart = QtCore.Signal()
 
     def __init__(self, config, **kwargs):
@@ -115,20 +118,61 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.errorcode = self._create_errorcode()
         self._set_constants()
 
+        # character buffers for the short strings returned by the library
+        # (at most 32 byte are needed), reused by all string getters
+        self._string_buffers = tuple(ctypes.create_string_buffer(80) for i in range(3))
+
         # the library can communicate with 8 devices:
         self.connected_to_device = False
 
+        # resolutions in ps, read from the device on first use. The current
+        # resolution is read again after every change of the binning.
+        self._base_resolution = None
+        self._resolution = None
+
         #FIXME: Check which architecture the host PC is and choose the dll
         # according to that!
 
         # Load the picoharp library file phlib64.dll from the folder
         # <Windows>/System32/
         self._dll = ctypes.cdll.LoadLibrary('phlib64')
+        self._set_dll_prototypes()
 
         # Just some default values:
         self._bin_width_ns = 3000
         self._record_length_ns = 100 *1e9
 
+        # histogram buffer, refilled by every call of get_histogram. The
+        # buffers never move in memory, so their addresses are kept as ready
+        # made void pointers for the library calls.
+        self._histogram = np.zeros((self.HISTCHAN,), dtype=np.uint32)
+        self._histogram_ptr = ctypes.c_void_p(self._histogram.ctypes.data)
+        # bin indices and time axis of the histogram, see get_histogram
+        self._bin_indices = np.arange(self.HISTCHAN, dtype=np.float64)
+        self._histogram_xdata = np.zeros((self.HISTCHAN,), dtype=np.float64)
+        # TTTR record buffer, refilled by every call of tttr_read_fifo
+        self._fifo_buffer = np.zeros((self.TTREADMAX,), dtype=np.uint32)
+        self._fifo_buffer_ptr = ctypes.c_void_p(self._fifo_buffer.ctypes.data)
+        # decoded channel numbers and time tags, see decode_t2_records
+        self._t2_channels = np.zeros((self.TTREADMAX,), dtype=np.uint32)
+        self._t2_times = np.zeros((self.TTREADMAX,), dtype=np.uint64)
+        self._t2_overflow_time = 0
+        # photon records per channel since the start of the measurement
+        self.channel_counts = np.zeros((15,), dtype=np.int64)
+        # status flags which were logged last, see _report_flags
+        self._reported_flags = 0
+
+        # time.monotonic() value at which the rate meters deliver a valid
+        # reading after PH_Initialize or PH_SetSyncDiv
+        self._rate_meter_ready_time = 0.0
+        # time.monotonic() value of the last count rate reading and the time
+        # between two readings in s, at least one gate time of the rate meters
+        self._last_count_time = 0.0
+        self._count_period = self.RATEGATE / 1000
+
+        # slow counter constraints, created on the first call of get_constraints
+        self._slow_counter_constraints = None
+
         self._photon_source2 = None #for compatibility reasons with second APD
         self._count_channel = 1
 
@@ -147,12 +191,8 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         # One need still to include this in the config.
         self.set_input_CFD(1,10,7)
 
-        # the signal has one argument of type object, which should allow
-        # anything to pass through:
-
         self.sigStart.connect(self.start_measure)
         self.sigReadoutPicoharp.connect(self.get_fresh_data_loop, QtCore.Qt.QueuedConnection) # ,QtCore.Qt.QueuedConnection
-        self.sigAnalyzeData.connect(self.analyze_received_data, QtCore.Qt.QueuedConnection)
         self.result = []
 
 
@@ -162,7 +202,6 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
         self.close_connection()
         self.sigReadoutPicoharp.disconnect()
-        self.sigAnalyzeData.disconnect()
 
     def _create_errorcode(self):
         """ Create a dictionary with the errorcode for the device.
@@ -172,24 +211,30 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         The errorcode is extracted of PHLib  Ver. 3.0, December 2013. The
         errorcode can be also extracted by calling the get_error_string method
         with the appropriate integer value.
+
+        The header file is parsed only once, all instances share the result.
         """
+        if PicoHarp300._errorcode is not None:
+            return PicoHarp300._errorcode
 
         maindir = get_main_dir()
 
-        filename = os.path.join(maindir, 'hardware', 'PicoQuant', 'errorcodes.h')
+        filename = os.path.join(maindir, 'hardware', 'picoquant', 'errorcodes.h')
         try:
             with open(filename) as f:
-                content = f.readlines()
-        except:
+                content = f.read()
+        except OSError:
             self.log.error('No file "errorcodes.h" could be found in the '
                            'PicoHarp hardware directory!')
+            return {}
 
         errorcode = {}
-        for line in content:
+        for line in content.splitlines():
             if '#define ERROR' in line:
                 errorstring, errorvalue = line.split()[-2:]
                 errorcode[int(errorvalue)] = errorstring
 
+        PicoHarp300._errorcode = errorcode
         return errorcode
 
     def _set_constants(self):
@@ -213,11 +258,14 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.OFFSETMAX = 1000000000
         self.SYNCOFFSMIN = -99999
         self.SYNCOFFSMAX	= 99999
+        self.CHANOFFSMIN = -8000
+        self.CHANOFFSMAX = 8000
 
         # in ms:
         self.ACQTMIN = 1
         self.ACQTMAX = 10*60*60*1000
         self.TIMEOUT = 80   # the maximal device timeout for a readout request
+        self.RATEGATE = 100 # gate time of the hardware rate meters
 
         # in ns:
         self.HOLDOFFMAX = 210480
@@ -226,9 +274,91 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.HISTCHAN = 65536    # number of histogram channels 2^16
         self.TTREADMAX = 131072  # 128K event records (2^17)
 
+        # in units of the T2 time tag:
+        self.T2WRAPAROUND = 210698240
+
         # in Hz:
         self.COUNTFREQ = 10
 
+        # (bitmask, name) of the status flags and warnings, to decode the
+        # bit patterns of get_flags and get_warnings in one pass:
+        self.FLAGS = ((0x0003, 'FLAG_FIFOFULL'),
+                      (0x0040, 'FLAG_OVERFLOW'),
+                      (0x0100, 'FLAG_SYSERROR'))
+        self.WARNINGS = ((0x0001, 'WARNING_INP0_RATE_ZERO'),
+                         (0x0002, 'WARNING_INP0_RATE_TOO_LOW'),
+                         (0x0004, 'WARNING_INP0_RATE_TOO_HIGH'),
+                         (0x0010, 'WARNING_INP1_RATE_ZERO'),
+                         (0x0040, 'WARNING_INP1_RATE_TOO_HIGH'),
+                         (0x0100, 'WARNING_INP_RATE_RATIO'),
+                         (0x0200, 'WARNING_DIVIDER_GREATER_ONE'),
+                         (0x0400, 'WARNING_TIME_SPAN_TOO_SMALL'),
+                         (0x0800, 'WARNING_OFFSET_UNNECESSARY'))
+
+    def _set_dll_prototypes(self):
+        """ Declare the argument and return types of all functions in phlib.h.
+
+        ctypes will then convert the arguments on a fast path instead of
+        guessing the type of each argument on every call. Character buffers
+        are passed directly, the histogram and FIFO buffers as addresses.
+
+        Functions missing in an older library version are skipped, so only
+        the features using them fail instead of loading the module.
+        """
+        c_int = ctypes.c_int32
+        p_int = ctypes.POINTER(ctypes.c_int32)
+        p_double = ctypes.POINTER(ctypes.c_double)
+        c_str = ctypes.c_char_p
+        c_buf = ctypes.c_void_p
+        prototypes = {
+            'PH_GetLibraryVersion': [c_str],
+            'PH_GetErrorString': [c_str, c_int],
+            'PH_OpenDevice': [c_int, c_str],
+            'PH_CloseDevice': [c_int],
+            'PH_Initialize': [c_int, c_int],
+            'PH_GetHardwareInfo': [c_int, c_str, c_str, c_str],
+            'PH_GetSerialNumber': [c_int, c_str],
+            'PH_GetFeatures': [c_int, p_int],
+            'PH_GetBaseResolution': [c_int, p_double, p_int],
+            'PH_GetHardwareDebugInfo': [c_int, c_str],
+            'PH_Calibrate': [c_int],
+            'PH_SetInputCFD': [c_int, c_int, c_int, c_int],
+            'PH_SetSyncDiv': [c_int, c_int],
+            'PH_SetSyncOffset': [c_int, c_int],
+            'PH_SetStopOverflow': [c_int, c_int, c_int],
+            'PH_SetBinning': [c_int, c_int],
+            'PH_SetOffset': [c_int, c_int],
+            'PH_SetMultistopEnable': [c_int, c_int],
+            'PH_ClearHistMem': [c_int, c_int],
+            'PH_StartMeas': [c_int, c_int],
+            'PH_StopMeas': [c_int],
+            'PH_CTCStatus': [c_int, p_int],
+            'PH_GetHistogram': [c_int, c_buf, c_int],
+            'PH_GetResolution': [c_int, p_double],
+            'PH_GetCountRate': [c_int, c_int, p_int],
+            'PH_GetFlags': [c_int, p_int],
+            'PH_GetElapsedMeasTime': [c_int, p_double],
+            'PH_GetWarnings': [c_int, p_int],
+            'PH_GetWarningsText': [c_int, c_str, c_int],
+            'PH_SetMarkerEnable': [c_int, c_int, c_int, c_int, c_int],
+            'PH_SetMarkerEdges': [c_int, c_int, c_int, c_int, c_int],
+            'PH_SetMarkerHoldoffTime': [c_int, c_int],
+            'PH_ReadFiFo': [c_int, c_buf, c_int, p_int],
+            'PH_GetRouterVersion': [c_int, c_str, c_str],
+            'PH_GetRoutingChannels': [c_int, p_int],
+            'PH_EnableRouting': [c_int, c_int],
+            'PH_SetRoutingChannelOffset': [c_int, c_int, c_int],
+            'PH_SetPHR800Input': [c_int, c_int, c_int, c_int],
+            'PH_SetPHR800CFD': [c_int, c_int, c_int, c_int],
+        }
+        for name, argtypes in prototypes.items():
+            if not hasattr(self._dll, name):
+                self.log.debug('PicoHarp: {0} is not exported by the library.'.format(name))
+                continue
+            func = getattr(self._dll, name)
+            func.argtypes = argtypes
+            func.restype = c_int
+
     def check(self, func_val):
         """ Check routine for the received error codes.
 
@@ -246,7 +376,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
         if not func_val == 0:
             self.log.error('Error in PicoHarp300 with errorcode {0}:\n'
-                           '{1}'.format(func_val, self.errorcode[func_val]))
+                           '{1}'.format(func_val, self.errorcode.get(func_val, 'unknown error')))
         return func_val
 
     # =========================================================================
@@ -258,8 +388,8 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
         @return string: string representation of the
                         Version number of the current library."""
-        buf = ctypes.create_string_buffer(16)   # at least 8 byte
-        self.check(self._dll.PH_GetLibraryVersion(ctypes.byref(buf)))
+        buf = self._string_buffers[0]   # at least 8 byte
+        self.check(self._dll.PH_GetLibraryVersion(buf))
         return buf.value # .decode() converts byte to string
 
     def get_error_string(self, errcode):
@@ -274,8 +404,8 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         or lower, since interger bigger 0 are not defined as error.
         """
 
-        buf = ctypes.create_string_buffer(80)   # at least 40 byte
-        self.check(self._dll.PH_GetErrorString(ctypes.byref(buf), errcode))
+        buf = self._string_buffers[0]   # at least 40 byte
+        self.check(self._dll.PH_GetErrorString(buf, errcode))
         return buf.value.decode() # .decode() converts byte to string
 
     # =========================================================================
@@ -286,9 +416,11 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         """ Open a connection to this device. """
 
 
-        buf = ctypes.create_string_buffer(16)   # at least 8 byte
-        ret = self.check(self._dll.PH_OpenDevice(self._deviceID, ctypes.byref(buf)))
+        buf = self._string_buffers[0]   # at least 8 byte
+        ret = self.check(self._dll.PH_OpenDevice(self._deviceID, buf))
         self._serial = buf.value.decode()   # .decode() converts byte to string
+        self._base_resolution = None
+        self._resolution = None
         if ret >= 0:
             self.connected_to_device = True
             self.log.info('Connection to the Picoharp 300 established')
@@ -303,7 +435,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         mode = int(mode)    # for safety reasons, convert to integer
         self._mode = mode
 
-        if not ((mode != self.MODE_HIST) or (mode != self.MODE_T2) or (mode != self.MODE_T3)):
+        if mode not in (self.MODE_HIST, self.MODE_T2, self.MODE_T3):
             self.log.error('Picoharp: Mode for the device could not be set. '
                            'It must be {0}=Histogram-Mode, {1}=T2-Mode or '
                            '{2}=T3-Mode, but a parameter {3} was '
@@ -314,6 +446,8 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
                            )
         else:
             self.check(self._dll.PH_Initialize(self._deviceID, mode))
+            self._resolution = None
+            self._restart_rate_meter()
 
     def close_connection(self):
         """Close the connection to the device.
@@ -338,11 +472,9 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         @return string tuple(3): (Model, Partnum, Version)
         """
 
-        model = ctypes.create_string_buffer(32)     # at least 16 byte
-        version = ctypes.create_string_buffer(16)   # at least 8 byte
-        partnum = ctypes.create_string_buffer(16)   # at least 8 byte
-        self.check(self._dll.PH_GetHardwareInfo(self._deviceID, ctypes.byref(model),
-                                                ctypes.byref(partnum), ctypes.byref(version)))
+        # model needs at least 16 byte, version and partnum at least 8 byte
+        model, version, partnum = self._string_buffers
+        self.check(self._dll.PH_GetHardwareInfo(self._deviceID, model, partnum, version))
 
         # the .decode() function converts byte objects to string objects
         return model.value.decode(), partnum.value.decode(), version.value.decode()
@@ -353,23 +485,31 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         @return string: serial number of the device
         """
 
-        serialnum = ctypes.create_string_buffer(16)   # at least 8 byte
-        self.check(self._dll.PH_GetSerialNumber(self._deviceID, ctypes.byref(serialnum)))
+        serialnum = self._string_buffers[0]   # at least 8 byte
+        self.check(self._dll.PH_GetSerialNumber(self._deviceID, serialnum))
         return serialnum.value.decode() # .decode() converts byte to string
 
     def get_base_resolution(self):
         """ Retrieve the base resolution of the device.
 
         @return double: the base resolution of the device
-        """
 
-        res = ctypes.c_double()
-        self.check(self._dll.PH_GetBaseResolution(self._deviceID, ctypes.byref(res)))
-        return res.value
+        The base resolution is fixed for a device, it is only read once.
+        """
+        if self._base_resolution is None:
+            res = ctypes.c_double()
+            binsteps = ctypes.c_int32()
+            ret = self.check(self._dll.PH_GetBaseResolution(self._deviceID, ctypes.byref(res),
+                                                            ctypes.byref(binsteps)))
+            if ret < 0:
+                return res.value
+            self._base_resolution = res.value
+        return self._base_resolution
 
     def calibrate(self):
         """ Calibrate the device."""
         self.check(self._dll.PH_Calibrate(self._deviceID))
+        self._resolution = None
 
     def get_features(self):
         """ Retrieve the possible features of the device.
@@ -420,13 +560,14 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         period. The readins obtained with PH_GetCountRate are corrected for the
         devider settin and deliver the external (undivided) rate.
         """
-        if not ( (div !=1) or (div !=2) or (div !=4) or (div !=8) ):
+        if div not in (1, 2, 4, 8):
             self.log.error('PicoHarp: Invalid sync devider.\n'
                            'Value must be 1, 2, 4 or 8 but a value of {0} was '
                            'passed.'.format(div))
             return
         else:
             self.check(self._dll.PH_SetSyncDiv(self._deviceID, div))
+            self._restart_rate_meter()
 
     def set_sync_offset(self, offset):
         """ Set the offset of the synchronization.
@@ -499,6 +640,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
                            'passed.'.format(0, self.BINSTEPSMAX, binning))
         else:
             self.check(self._dll.PH_SetBinning(self._deviceID, binning))
+            self._resolution = None
 
     def set_multistop_enable(self, enable=True):
         """ Set whether multistops are possible within a measurement.
@@ -581,12 +723,15 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
                         depending if xdata = True, also the xdata are passed in
                         ns.
 
+        The returned arrays are reused and overwritten by the next call, copy
+        them if they have to be kept.
         """
-        chcount = np.zeros((self.HISTCHAN,), dtype=np.uint32)
-        # buf.ctypes.data is the reference to the array in the memory.
-        self.check(self._dll.PH_GetHistogram(self._deviceID, chcount.ctypes.data, block))
+        chcount = self._histogram
+        self.check(self._dll.PH_GetHistogram(self._deviceID, self._histogram_ptr, block))
         if xdata:
-            xbuf = np.arange(self.HISTCHAN) * self.get_resolution() / 1000
+            # resolution is given in ps, convert it to ns for the time axis
+            xbuf = np.multiply(self._bin_indices, self.get_resolution() / 1000,
+                               out=self._histogram_xdata)
             return xbuf, chcount
         return chcount
 
@@ -594,11 +739,22 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         """ Retrieve the current resolution of the picohard.
 
         @return double: resolution at current binning.
-        """
 
-        resolution = ctypes.c_double()
-        self.check(self._dll.PH_GetResolution(self._deviceID, ctypes.byref(resolution)))
-        return resolution.value
+        The value is kept until the binning is changed or the device is
+        initialized or calibrated again.
+        """
+        if self._resolution is None:
+            resolution = ctypes.c_double()
+            ret = self.check(self._dll.PH_GetResolution(self._deviceID, ctypes.byref(resolution)))
+            if ret < 0:
+                return resolution.value
+            self._resolution = resolution.value
+        return self._resolution
+
+    def _restart_rate_meter(self):
+        """ Note that the rate meters need a full gate time for a valid reading.
+        """
+        self._rate_meter_ready_time = time.monotonic() + self.RATEGATE / 1000
 
     def get_count_rate(self, channel):
         """ Get the current count rate for the
@@ -616,7 +772,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         are very low. If accurate rates are needed you must perform a full
         blown measurement and sum up the recorded events.
         """
-        if not ((channel !=0) or (channel != 1)):
+        if channel not in (0, 1):
             self.log.error('PicoHarp: Count Rate could not be read out, '
                            'Channel does not exist.\nChannel has to be 0 or 1 '
                            'but {0} was passed.'.format(channel))
@@ -642,6 +798,27 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.check(self._dll.PH_GetFlags(self._deviceID, ctypes.byref(flags)))
         return flags.value
 
+    def decode_flags(self, flags=None):
+        """ Translate the status flags into their names.
+
+        @param int flags: optional, bit pattern as returned by get_flags. If
+                          nothing is passed, the flags are read from the device.
+
+        @return list: names (as in phdefin.h) of all flags which are set
+        """
+        if flags is None:
+            flags = self.get_flags()
+        return [name for mask, name in self.FLAGS if flags & mask]
+
+    def _report_flags(self):
+        """ Log the status flags of the device whenever they change. """
+        flags = self.get_flags()
+        if flags != self._reported_flags:
+            self._reported_flags = flags
+            if flags:
+                self.log.warning('PicoHarp: Status flags set: {0}'.format(
+                    ', '.join(self.decode_flags(flags))))
+
     def get_elepased_meas_time(self):
         """ Retrieve the elapsed measurement time in ms.
 
@@ -663,6 +840,35 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.check(self._dll.PH_GetWarnings(self._deviceID, ctypes.byref(warnings)))
         return warnings.value
 
+    def decode_warnings(self, warnings=None):
+        """ Translate the warning bit pattern into the warning names.
+
+        @param int warnings: optional, bit pattern as returned by get_warnings.
+                             If nothing is passed, the warnings are read from
+                             the device.
+
+        @return list: names (as in phdefin.h) of all warnings which are set
+        """
+        if warnings is None:
+            warnings = self.get_warnings()
+        return [name for mask, name in self.WARNINGS if warnings & mask]
+
+    def _report_warnings(self):
+        """ Log the warnings about the input signals, if there are any.
+
+        The count rates of both channels are read first, as required by
+        PH_GetWarnings.
+        """
+        delay = self._rate_meter_ready_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        for channel in (0, 1):
+            self.get_count_rate(channel)
+        warnings = self.get_warnings()
+        if warnings:
+            self.log.warning('PicoHarp: Warnings: {0}'.format(
+                ', '.join(self.decode_warnings(warnings))))
+
     def get_warnings_text(self, warning_num):
         """Retrieve the warningtext for the corresponding warning bitmask.
 
@@ -672,7 +878,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
         """
         text = ctypes.create_string_buffer(32568) # buffer at least 16284 byte
-        self.check(self._dll.PH_GetWarningsText(self._deviceID, warning_num, text))
+        self.check(self._dll.PH_GetWarningsText(self._deviceID, text, warning_num))
         return text.value
 
     def get_hardware_debug_info(self):
@@ -710,6 +916,8 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         Function will return after a timeout period of 80 ms even if not all
         data could be fetched. Return value indicates how many records were
         fetched. Buffer must not be accessed until the function returns!
+
+        The returned buffer is reused and overwritten by the next call.
         """
 
         # if type(num_counts) is not int:
@@ -735,11 +943,11 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
         num_counts = self.TTREADMAX
 
-        buffer = np.zeros((num_counts,), dtype=np.uint32)
+        buffer = self._fifo_buffer
 
         actual_num_counts = ctypes.c_int32()
 
-        self.check(self._dll.PH_ReadFiFo(self._deviceID, buffer.ctypes.data,
+        self.check(self._dll.PH_ReadFiFo(self._deviceID, self._fifo_buffer_ptr,
                                          num_counts, ctypes.byref(actual_num_counts)))
 
 
@@ -765,7 +973,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
                            'me2={2}, me3={3},'.format(me0, me1, me2, me3))
             return
         else:
-            self.check(self._dll.PH_TTSetMarkerEdges(self._deviceID, me0, me1,
+            self.check(self._dll.PH_SetMarkerEdges(self._deviceID, me0, me1,
                                                      me2, me3))
 
     def tttr_set_marker_enable(self, me0, me1, me2, me3):
@@ -792,7 +1000,7 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.check(self._dll.PH_SetMarkerEnable(self._deviceID, me0,
                                                 me1, me2, me3))
 
-    def tttr_set_marker_holdofftime(self, holfofftime):
+    def tttr_set_marker_holdofftime(self, holdofftime):
         """ Set the holdofftime for the markers.
 
         @param int holdofftime: holdofftime in ns. Maximal value is HOLDOFFMAX.
@@ -809,9 +1017,9 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
             self.log.error('PicoHarp: Holdofftime could not be set.\n'
                            'Value of holdofftime must be within the range '
                            '[0,{0}], but a value of {1} was passed.'
-                           ''.format(self.HOLDOFFMAX, holfofftime))
+                           ''.format(self.HOLDOFFMAX, holdofftime))
         else:
-            self.check(self._dll.PH_SetMarkerHoldofftime(self._deviceID, holfofftime))
+            self.check(self._dll.PH_SetMarkerHoldoffTime(self._deviceID, holdofftime))
 
     # =========================================================================
     #  Special functions for Routing Devices
@@ -847,20 +1055,19 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
                                 entry the router version.
         """
         # pointer to a buffer for at least 8 characters:
-        model_number = ctypes.create_string_buffer(16)
-        version_number =  ctypes.create_string_buffer(16)
+        model_number, version_number = self._string_buffers[:2]
 
-        self.check(self._dll.PH_GetRouterVersion(self._deviceID,
-                                                 ctypes.byref(model_number),
-                                                 ctypes.byref(version_number)))
+        self.check(self._dll.PH_GetRouterVersion(self._deviceID, model_number, version_number))
 
         return [model_number.value.decode(), version_number.value.decode()]
 
-    def set_routing_channel_offset(self, offset_time):
+    def set_routing_channel_offset(self, channel, offset_time):
         """ Set the offset for the routed channels to compensate cable delay.
 
+        @param int channel: which router channel is going to be programmed.
+                            This number but be within the range [0,3].
         @param int offset_time: offset (time shift) in ps for that channel.
-                                Value must be within [OFFSETMIN,OFFSETMAX]
+                                Value must be within [CHANOFFSMIN,CHANOFFSMAX]
 
         Note: This function can be used to compensate small timing delays
               between the individual routing channels. It is similar to
@@ -870,14 +1077,19 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
               cable in that channel.
         """
 
-        if not(self.OFFSETMIN <= offset_time <= self.OFFSETMAX):
+        if channel not in range(0, 4):
+            self.log.error('PicoHarp: Invalid channel for routing.\n'
+                           'The channel must be within the interval [0,3], but a value '
+                           'of {0} was passed.'.format(channel))
+            return
+        if not(self.CHANOFFSMIN <= offset_time <= self.CHANOFFSMAX):
             self.log.error('PicoHarp: Invalid offset time for routing.\nThe '
                            'offset time was expected to be within the interval '
                            '[{0},{1}] ps, but a value of {2} was passed.'
-                           ''.format(self.OFFSETMIN, self.OFFSETMAX, offset_time))
+                           ''.format(self.CHANOFFSMIN, self.CHANOFFSMAX, offset_time))
             return
         else:
-            self.check(self._dll.PH_SetRoutingChannelOffset(self._deviceID, offset_time))
+            self.check(self._dll.PH_SetRoutingChannelOffset(self._deviceID, channel, offset_time))
 
     def set_phr800_input(self, channel, level, edge):
         """ Configure the input channels of the PHR800 device.
@@ -975,7 +1187,14 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         channels simultaneously the count rates.
 
         @return int: error code (0:OK, -1:error)
+
+        The clock frequency only sets the pace at which get_counter delivers
+        readings, never faster than one gate time of the rate meters.
         """
+        self._count_period = self.RATEGATE / 1000
+        if clock_frequency:
+            self._count_period = max(self._count_period, 1 / clock_frequency)
+
         self.log.info('Picoharp: The Hardware clock for the Picoharp is not '
                       'programmable!\n'
                       'It is a gated counter every 100ms. That you cannot change. '
@@ -1014,14 +1233,19 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
         @return SlowCounterConstraints: constraints class for slow counter
 
+        The constraints are fixed, so the same instance is returned by every
+        call. Do not modify it.
+
         FIXME: ask hardware for limits when module is loaded
         """
-        constraints = SlowCounterConstraints()
-        constraints.max_detectors = 1
-        constraints.min_count_frequency = 1e-3
-        constraints.max_count_frequency = 10e9
-        conetraints.counting_mode = [CountingMode.CONTINUOUS]
-        return constraints
+        if self._slow_counter_constraints is None:
+            constraints = SlowCounterConstraints()
+            constraints.max_detectors = 1
+            constraints.min_count_frequency = 1e-3
+            constraints.max_count_frequency = 10e9
+            constraints.counting_mode = [CountingMode.CONTINUOUS]
+            self._slow_counter_constraints = constraints
+        return self._slow_counter_constraints
 
     def get_counter(self, samples=None):
         """ Returns the current counts per second of the counter.
@@ -1029,8 +1253,17 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         @param int samples: if defined, number of samples to read in one go
 
         @return float: the photon counts per second
+
+        The call blocks until one clock period has passed since the last
+        reading and the rate meters deliver a valid value after a restart,
+        which paces the counting loop of the logic.
         """
-        time.sleep(0.05)
+        next_time = max(self._rate_meter_ready_time,
+                        self._last_count_time + self._count_period)
+        delay = next_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._last_count_time = time.monotonic()
         return [self.get_count_rate(self._count_channel)]
 
     def close_counter(self):
@@ -1158,6 +1391,11 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         self.lock()
 
         self.meas_run = True
+        self._t2_overflow_time = 0
+        self.channel_counts[:] = 0
+        self._reported_flags = 0
+
+        self._report_warnings()
 
         # start the device:
         self.start(int(self._record_length_ns/1e6))
@@ -1176,8 +1414,11 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
         buffer, actual_counts = self.tttr_read_fifo()
         #        buffer, actual_counts = [1,2,3,4,5,6,7,8,9], 9
 
-        # This analysis signel should be analyzed in a queued thread:
-        self.sigAnalyzeData.emit(buffer[0:actual_counts-1], actual_counts)
+        # The analysis runs in the readout thread, so it is done directly
+        # instead of through a queued signal. The view is analyzed before the
+        # next readout refills the buffer.
+        self.analyze_received_data(buffer[:actual_counts], actual_counts)
+        self._report_flags()
 
         if not self.meas_run:
             with self.threadlock:
@@ -1191,6 +1432,37 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
 
 
 
+    def decode_t2_records(self, records):
+        """ Decode the records of a T2 mode readout into channels and times.
+
+        @param numpy.ndarray records: uint32 records as read by tttr_read_fifo
+
+        @return tuple(numpy.ndarray, numpy.ndarray): channel numbers and time
+                tags of the photon records. Special records (overflows and
+                external markers) are removed and the overflows are added to
+                the time tags, so these count from the start of the
+                measurement.
+
+        All records are decoded at once with numpy operations into buffers
+        allocated in __init__, the overflow time is kept between calls.
+        """
+        num_records = len(records)
+        channels = np.right_shift(records, 28, out=self._t2_channels[:num_records])
+        times = np.bitwise_and(records, 0x0FFFFFFF, out=self._t2_times[:num_records])
+
+        special = channels == 15
+        # an overflow is a special record with the lower 4 bits of the time
+        # tag set to zero, the other special records are external markers
+        overflows = np.cumsum(special & ((times & 0xF) == 0), dtype=np.uint64)
+        overflows *= self.T2WRAPAROUND
+        overflows += self._t2_overflow_time
+        times += overflows
+        if num_records > 0:
+            self._t2_overflow_time = int(overflows[-1])
+
+        photons = ~special
+        return channels[photons], times[photons]
+
     def analyze_received_data(self, arr_data, actual_counts):
         """ Analyze the actual data obtained from the TTTR mode of the device.
 
@@ -1271,10 +1543,10 @@ class PicoHarp300(Base, SlowCounterInterface, FastCounterInterface):
                       the channel-number are set to high (i.e. 1).
         """
 
-        # at first just a simple test
-        time.sleep(0.2)
+        channels, times = self.decode_t2_records(arr_data[:actual_counts])
 
-        self.data_trace[self.count] = actual_counts
+        self.data_trace[self.count] = len(channels)
+        self.channel_counts += np.bincount(channels, minlength=self.channel_counts.size)
         self.count += 1
 
         if self.count > self._number_of_gates-1:
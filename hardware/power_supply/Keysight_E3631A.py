@@ -49,7 +49,7 @@ class E3631A(Base, ProcessControlInterface):
 
         rm = visa.ResourceManager()
         try:
-            self._inst = rm.open_resource(self._address)
+            self._inst = rm.open_resource(self._address, write_termination='\n', read_termination='\n')
         except visa.VisaIOError:
             self.log.error('Could not connect to hardware. Please check the wires and the address.')
 
@@ -59,11 +59,8 @@ class E3631A(Base, ProcessControlInterface):
         time.sleep(3)
         self._query("*OPC?")
 
-        self._write("INST P6V")
-        self._write("VOLT 0")
-        self._write("CURR {}".format(self._current_max))
-
-        self._write("OUTP ON")
+        # one compound message, the leading colons restart from the root node
+        self._write("INST P6V;:VOLT 0;:CURR {};:OUTP ON".format(self._current_max))
 
     def on_deactivate(self):
         """ Stops the module """
@@ -79,6 +76,10 @@ class E3631A(Base, ProcessControlInterface):
         """ Function to query hardware"""
         return self._inst.query(cmd)
 
+    def _query_float(self, cmd):
+        """ Function to query a single number from hardware"""
+        return self._inst.query_ascii_values(cmd)[0]
+
     def set_control_value(self, value):
         """ Set control value, here heating power.
 
@@ -95,7 +96,7 @@ class E3631A(Base, ProcessControlInterface):
 
             @return float: current control value
         """
-        return float(self._query("VOLT?").split('\r')[0])
+        return self._query_float("VOLT?")
 
     def get_control_unit(self):
         """ Get unit of control value.
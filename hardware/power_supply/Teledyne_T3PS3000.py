@@ -87,6 +87,10 @@ class PowerSupply(Base, ProcessControlInterface):
         """ Function to query hardware"""
         return self._inst.query(cmd)
 
+    def _query_float(self, cmd):
+        """ Function to query a single number from hardware"""
+        return self._inst.query_ascii_values(cmd)[0]
+
     def set_control_value(self, value):
         """ Set control value, here heating power.
 
@@ -103,7 +107,7 @@ class PowerSupply(Base, ProcessControlInterface):
 
             @return float: current control value
         """
-        return float(self._query("MEASure:VOLTage? CH1").split('\r')[0])
+        return self._query_float("MEASure:VOLTage? CH1")
 
     def get_control_unit(self):
         """ Get unit of control value.
@@ -55,6 +55,9 @@ class HardwareSwitchFpga(Base, SwitchInterface):
     # possible type options: XEM6310_LX150, XEM6310_LX45
     _fpga_type = ConfigOption('fpga_type', default='XEM6310_LX45', missing='warn')
 
+    # bit of each channel in the wire in/out value
+    _channel_masks = tuple(1 << chnl for chnl in range(8))
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -182,9 +185,9 @@ class HardwareSwitchFpga(Base, SwitchInterface):
 
             # encode channel states
             chnl_state = 0
-            for chnl in list(new_state):
-                if new_state[chnl]:
-                    chnl_state += int(2 ** chnl)
+            for chnl, state in new_state.items():
+                if state:
+                    chnl_state |= self._channel_masks[chnl]
 
             # apply changes in hardware
             self._fpga.SetWireInValue(0x00, chnl_state)
@@ -209,9 +212,9 @@ class HardwareSwitchFpga(Base, SwitchInterface):
 
             # encode channel states
             chnl_state = 0
-            for chnl in list(new_state):
-                if new_state[chnl]:
-                    chnl_state += int(2 ** chnl)
+            for chnl, state in new_state.items():
+                if state:
+                    chnl_state |= self._channel_masks[chnl]
 
             # apply changes in hardware
             self._fpga.SetWireInValue(0x00, chnl_state)
@@ -253,9 +256,6 @@ class HardwareSwitchFpga(Base, SwitchInterface):
     def _get_all_states(self):
         self._fpga.UpdateWireOuts()
         new_state = int(self._fpga.GetWireOutValue(0x20))
-        for chnl in list(self._switch_status):
-            if new_state & (2 ** chnl) != 0:
-                self._switch_status[chnl] = True
-            else:
-                self._switch_status[chnl] = False
+        for chnl in self._switch_status:
+            self._switch_status[chnl] = bool(new_state & self._channel_masks[chnl])
         return self._switch_status